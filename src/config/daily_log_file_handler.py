@@ -1,22 +1,38 @@
 import logging
 import os
+import threading
 from datetime import datetime
 
 
 class DailyLogFileHandler(logging.Handler):
-    def __init__(self, log_dir="logs"):
+    def __init__(self, log_dir="logs", flush_interval=1.0):
         super().__init__()
         self.log_dir = log_dir
-        os.makedirs(log_dir, exist_ok=True)
-        self.current_date = datetime.now().date()
-        self._open_new_file()
+        self.flush_interval = flush_interval
+        self.current_date = None
+        self.baseFilename = None
+        self.stream = None
+        self._stop_flushing = threading.Event()
+        self._flush_thread = None
 
     def _open_new_file(self):
-        if hasattr(self, "stream") and self.stream:
+        # Opened on the first emit, so importing the logger never touches disk.
+        if self.stream:
             self.stream.close()
+        os.makedirs(self.log_dir, exist_ok=True)
         filename = self.current_date.strftime("%Y-%m-%d.log")
         self.baseFilename = os.path.join(self.log_dir, filename)
-        self.stream = open(self.baseFilename, "a", encoding="utf-8")
+        self.stream = open(self.baseFilename, "a", buffering=1 << 16, encoding="utf-8")
+        if self._flush_thread is None:
+            self._flush_thread = threading.Thread(
+                target=self._flush_periodically, name="log-flush", daemon=True
+            )
+            self._flush_thread.start()
+
+    def _flush_periodically(self):
+        # Buffered records reach disk within flush_interval even when idle.
+        while not self._stop_flushing.wait(self.flush_interval):
+            self.flush()
 
     def emit(self, record):
         now = datetime.now().date()
@@ -25,9 +41,26 @@ class DailyLogFileHandler(logging.Handler):
             self._open_new_file()
         msg = self.format(record)
         self.stream.write(msg + "\n")
-        self.stream.flush()
+        # Warnings and errors are written through immediately, everything else
+        # is flushed by the flush thread every flush_interval.
+        if record.levelno >= logging.WARNING:
+            self.flush()
+
+    def flush(self):
+        self.acquire()
+        try:
+            if self.stream:
+                self.stream.flush()
+        finally:
+            self.release()
 
     def close(self):
-        if self.stream:
-            self.stream.close()
+        self._stop_flushing.set()
+        self.acquire()
+        try:
+            if self.stream:
+                self.stream.close()
+                self.stream = None
+        finally:
+            self.release()
         super().close()
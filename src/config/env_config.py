@@ -0,0 +1,43 @@
+import os
+from dataclasses import dataclass
+from functools import lru_cache
+
+from dotenv import load_dotenv
+
+
+@dataclass(frozen=True, slots=True)
+class EnvConfig:
+    trading_mode: str
+    gate_url_host: str
+    api_key: str
+    api_secret: str
+    discord_webhook_url: str
+    symbol_list: tuple[str, ...]
+    ohlcv_timeframe: str
+    atr_period: int
+    ohlcv_count: int
+    leverage: int
+
+
+@lru_cache(maxsize=1)
+def get_config() -> EnvConfig:
+    """
+    Loads the .env file once and returns the parsed configuration.
+    LIVE/TEST specific values are resolved from GATE_TRADING_MODE.
+    """
+    load_dotenv()
+
+    trading_mode = os.getenv("GATE_TRADING_MODE").upper()
+    suffix = "LIVE" if trading_mode == "LIVE" else "TEST"
+    return EnvConfig(
+        trading_mode=trading_mode,
+        gate_url_host=os.getenv(f"GATE_URL_HOST_{suffix}"),
+        api_key=os.getenv(f"API_KEY_{suffix}"),
+        api_secret=os.getenv(f"API_SECRET_{suffix}"),
+        discord_webhook_url=os.getenv(f"DISCORD_WEBHOOK_URL_{suffix}"),
+        symbol_list=tuple(os.getenv("SYMBOL_LIST").split(",")),
+        ohlcv_timeframe=os.getenv("OHLCV_TIMEFRAME"),
+        atr_period=int(os.getenv("ATR_PERIOD")),
+        ohlcv_count=int(os.getenv("OHLCV_COUNT")),
+        leverage=int(os.getenv("LEVERAGE")),
+    )
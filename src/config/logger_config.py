@@ -1,4 +1,7 @@
+import atexit
 import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener
 
 from .daily_log_file_handler import DailyLogFileHandler
 
@@ -12,9 +15,21 @@ stream_handler.setFormatter(
     logging.Formatter("%(asctime)s - %(levelname)s - %(message)s")
 )
 
+# QueueHandler.prepare merges msg % args on the calling thread; the final
+# Formatter and all file/console I/O run on the listener thread.
+log_queue = queue.SimpleQueue()
+queue_listener = QueueListener(
+    log_queue, file_handler, stream_handler, respect_handler_level=True
+)
+queue_listener.start()
+atexit.register(queue_listener.stop)
+
+queue_handler = QueueHandler(log_queue)
+queue_handler.setFormatter(logging.Formatter("%(message)s"))
+
 logging.basicConfig(
     level=logging.INFO,
-    handlers=[file_handler, stream_handler],
+    handlers=[queue_handler],
 )
 
 log = logging.getLogger(__name__)
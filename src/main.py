@@ -1,120 +1,146 @@
-import os
 import time
+from concurrent.futures import ThreadPoolExecutor
+
 import schedule
+from urllib3.util.retry import Retry
 
-from dotenv import load_dotenv
 from gate_api import Configuration, ApiClient, FuturesApi, UnifiedApi
-from gate_api.models.futures_candlestick import FuturesCandlestick
-from gate_api.models.futures_ticker import FuturesTicker
 
+from config.env_config import get_config
 from config.logger_config import log
 from service.discord_client import DiscordClient
 from service.order_handler import OrderHandler
 from service.renko_calculator import RenkoCalculator
+from service import renko_core
 
-# Load environment variables from .env file
-load_dotenv()
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    # orjson is optional; without it responses are decoded with the stdlib.
+    from json import loads as json_loads
 
-TRADING_MODE = os.getenv("GATE_TRADING_MODE").upper()
-GATE_URL_HOST = (
-    os.getenv("GATE_URL_HOST_LIVE")
-    if TRADING_MODE == "LIVE"
-    else os.getenv("GATE_URL_HOST_TEST")
-)
-API_KEY = (
-    os.getenv("API_KEY_LIVE") if TRADING_MODE == "LIVE" else os.getenv("API_KEY_TEST")
-)
-API_SECRET = (
-    os.getenv("API_SECRET_LIVE")
-    if TRADING_MODE == "LIVE"
-    else os.getenv("API_SECRET_TEST")
-)
-DISCORD_WEBHOOK_URL = (
-    os.getenv("DISCORD_WEBHOOK_URL_LIVE")
-    if TRADING_MODE == "LIVE"
-    else os.getenv("DISCORD_WEBHOOK_URL_TEST")
-)
-
-SYMBOL_LIST = os.getenv("SYMBOL_LIST").split(",")
-OHLCV_TIMEFRAME = os.getenv("OHLCV_TIMEFRAME")
-ATR_PERIOD = int(os.getenv("ATR_PERIOD"))
-OHLCV_COUNT = int(os.getenv("OHLCV_COUNT"))
-LEVERAGE = int(os.getenv("LEVERAGE"))
+# Load environment variables from .env file
+CFG = get_config()
+# Upper bound on concurrent Gate requests (historical candlesticks, contracts)
+MAX_CONCURRENT_REQUESTS = 8
 
 
 # Dependencies initialization
 gate_configuration = Configuration(
-    host=GATE_URL_HOST,
-    key=API_KEY,
-    secret=API_SECRET,
+    host=CFG.gate_url_host,
+    key=CFG.api_key,
+    secret=CFG.api_secret,
+)
+# Transient failures on idempotent GETs are retried with backoff by urllib3;
+# orders (POST) are never retried
+gate_configuration.retries = Retry(
+    total=5,
+    backoff_factor=0.5,
+    status_forcelist=(429, 500, 502, 503, 504),
+    allowed_methods=frozenset(["GET"]),
+    raise_on_status=False,
 )
+# Keep one pooled keep-alive connection per concurrent request
+gate_configuration.connection_pool_maxsize = MAX_CONCURRENT_REQUESTS
 gate_client = ApiClient(configuration=gate_configuration)
 gate_futures_api = FuturesApi(api_client=gate_client)
 gate_unified_api = UnifiedApi(api_client=gate_client)
-discord_client = DiscordClient(url=DISCORD_WEBHOOK_URL)
+discord_client = DiscordClient(url=CFG.discord_webhook_url)
 order_handler = OrderHandler(
     gate_futures_api=gate_futures_api,
     gate_unified_api=gate_unified_api,
     discord_client=discord_client,
-    symbol_list=SYMBOL_LIST,
-    leverage=LEVERAGE,
+    symbol_list=CFG.symbol_list,
+    leverage=CFG.leverage,
+    max_concurrent_requests=MAX_CONCURRENT_REQUESTS,
 )
 renko_calculator = RenkoCalculator(
-    symbol_list=SYMBOL_LIST,
-    ohlcv_timeframe=OHLCV_TIMEFRAME,
-    atr_period=ATR_PERIOD,
-    ohlcv_count=OHLCV_COUNT,
+    symbol_list=CFG.symbol_list,
+    ohlcv_timeframe=CFG.ohlcv_timeframe,
+    atr_period=CFG.atr_period,
+    ohlcv_count=CFG.ohlcv_count,
     discord_client=discord_client,
     order_handler=order_handler,
 )
 
 
+def fetch_candlestick_rows(symbol: str) -> list[dict]:
+    # Read the raw JSON body instead of letting the SDK build a model per row
+    response = gate_futures_api.list_futures_candlesticks(
+        settle="usdt",
+        contract=symbol,
+        limit=CFG.ohlcv_count,
+        interval=CFG.ohlcv_timeframe,
+        _preload_content=False,
+    )
+    return json_loads(response.data)
+
+
 def initialize_historical_data():
     discord_client.push_log_buffer("[Main] Renko trader started")
-    for symbol in SYMBOL_LIST:
-        candlestick_list: list[FuturesCandlestick] = (
-            gate_futures_api.list_futures_candlesticks(
-                settle="usdt",
-                contract=symbol,
-                limit=OHLCV_COUNT,
-                interval=OHLCV_TIMEFRAME,
+    # Requests are network-bound, so fetch every symbol concurrently
+    with ThreadPoolExecutor(
+        max_workers=min(MAX_CONCURRENT_REQUESTS, len(CFG.symbol_list))
+    ) as executor:
+        candlestick_rows_list = executor.map(fetch_candlestick_rows, CFG.symbol_list)
+        for symbol, candlestick_rows in zip(CFG.symbol_list, candlestick_rows_list):
+            renko_calculator.set_ohlcv_rows_into_symbol_data_list(
+                symbol=symbol, candlestick_rows=candlestick_rows
             )
-        )
-        renko_calculator.set_ohlcv_list_into_symbol_data_list(
-            symbol=symbol, candlestick_list=candlestick_list
-        )
     renko_calculator.set_brick_size_into_symbol_data_list()
     renko_calculator.set_renko_list_into_symbol_data_list()
     discord_client.push_log_buffer(
-        f"[Main] Historical data loaded on {len(SYMBOL_LIST)} symbols: {str(SYMBOL_LIST)}"
+        f"[Main] Historical data loaded on {len(CFG.symbol_list)} symbols: {list(CFG.symbol_list)}"
     )
     discord_client.flush_log_buffer()
-    for symbol in SYMBOL_LIST:
+    for symbol in CFG.symbol_list:
         renko_calculator.send_renko_plot_to_discord(symbol=symbol)
 
 
 def fetch_then_process_ticker_data():
     try:
-        ticker_data_list: FuturesTicker = gate_futures_api.list_futures_tickers(
-            settle="usdt"
+        # Read the raw JSON body instead of building a FuturesTicker per contract
+        response = gate_futures_api.list_futures_tickers(
+            settle="usdt", _preload_content=False
         )
-        renko_calculator.handle_new_ticker_data(ticker_data_list)
+        renko_calculator.handle_new_ticker_rows(json_loads(response.data))
     except Exception as e:
-        log.error(f"[Main] Error fetching ticker data: {e}")
-        time.sleep(5)
-        fetch_then_process_ticker_data()
+        # The main loop calls this again on the next tick, no need to retry here
+        log.error("[Main] Error fetching ticker data: %s", e)
+
+
+TICK_INTERVAL_SECONDS = 1.0
 
 
 def main():
+    renko_core.warm_up()
     initialize_historical_data()
-    schedule.every(1).seconds.do(fetch_then_process_ticker_data)
     schedule.every().hour.at(":00").do(
         order_handler.send_symbol_position_list_to_discord
     )
     schedule.every().saturday.at("09:00").do(initialize_historical_data)
-    while True:
-        schedule.run_pending()
-        time.sleep(1)
+    # Ticker polling runs directly on a drift-corrected monotonic clock,
+    # schedule only handles the hourly/weekly jobs
+    process_tickers = fetch_then_process_ticker_data
+    run_pending = schedule.run_pending
+    monotonic = time.monotonic
+    sleep = time.sleep
+    next_tick = monotonic()
+    try:
+        while True:
+            process_tickers()
+            run_pending()
+            next_tick += TICK_INTERVAL_SECONDS
+            delay = next_tick - monotonic()
+            if delay > 0:
+                sleep(delay)
+            else:
+                # Fell behind (e.g. a weekly re-init), resume from now
+                next_tick = monotonic()
+    finally:
+        renko_calculator.close()
+        order_handler.close()
+        discord_client.close()
 
 
 def test():
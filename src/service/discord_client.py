@@ -1,62 +1,215 @@
-from datetime import datetime
+import queue
+import threading
+import time
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 from config.logger_config import log
 
+try:
+    from orjson import dumps as _json_dumps
+except ImportError:
+    # orjson is optional; without it payloads are encoded with the stdlib.
+    import json
+
+    def _json_dumps(obj) -> bytes:
+        return json.dumps(obj).encode("utf-8")
+
+
+# Discord rejects messages over 2000 characters
+MAX_MESSAGE_LENGTH = 1900
+# Buffered log lines are sent once they reach this size or age
+FLUSH_BUFFER_LENGTH = 1500
+FLUSH_INTERVAL_SECONDS = 2.0
+_JSON_HEADERS = {"Content-Type": "application/json"}
+
+
+class _RateLimitRetry(Retry):
+    # urllib3 also retries 413/503 responses carrying Retry-After; a webhook
+    # POST is only safe to resend after a 429
+    RETRY_AFTER_STATUS_CODES = frozenset([429])
+
 
 class DiscordClient:
-    def __init__(self, url: str):
+    def __init__(self, url: str, timeout: float = 5.0):
         self.url = url
-        self._log_buffer = ""
+        self.timeout = timeout
+        self._log_buffer: list[str] = []
+        self._log_buffer_length = 0
+        self._log_buffer_lock = threading.Lock()
+        self._last_flush_ts = time.monotonic()
+        # Reuse one keep-alive connection for every webhook call
+        self._session = requests.Session()
+        self._session.mount(
+            "https://",
+            HTTPAdapter(
+                pool_connections=1,
+                pool_maxsize=4,
+                # Webhook POSTs are not idempotent: only retry when Discord
+                # certainly did not process the request (connection refused
+                # or rate limited, honouring Retry-After), never after a
+                # read timeout or a 5xx that may already have posted.
+                max_retries=_RateLimitRetry(
+                    total=3,
+                    read=0,
+                    other=0,
+                    backoff_factor=0.2,
+                    status_forcelist=(429,),
+                    allowed_methods=frozenset(["POST"]),
+                    respect_retry_after_header=True,
+                    raise_on_status=False,
+                ),
+            ),
+        )
+        # Webhook calls are made by a single sender thread so a slow Discord
+        # response never stalls the trading loop
+        self._queue = queue.Queue(maxsize=256)
+        self._worker = threading.Thread(
+            target=self._drain, name="discord-sender", daemon=True
+        )
+        if not url:
+            # No webhook configured: keep local logging, never post anything
+            self._enqueue = lambda kind, payload: None
+            return
+        self._worker.start()
 
-    def _send_message(self, message: str):
+    def _enqueue(self, kind: str, payload):
         try:
-            response = requests.post(self.url, json={"content": message})
-            if response.status_code == 204:
+            self._queue.put_nowait((kind, payload))
+        except queue.Full:
+            log.warning("[Discord] Send queue is full, dropping %s.", kind)
+
+    def _drain(self):
+        while True:
+            try:
+                item = self._queue.get(timeout=FLUSH_INTERVAL_SECONDS)
+            except queue.Empty:
+                item = ()
+            if item is None:
                 return
-            else:
-                log.error(
-                    f"[Discord] Failed to send notification. Status: {response.status_code}"
+            if item:
+                kind, payload = item
+                try:
+                    if kind == "message":
+                        self._send_message(payload)
+                    elif kind == "image":
+                        self._send_image(payload)
+                except Exception:
+                    # Keep the sender alive, but surface the bug with a traceback
+                    log.exception("[Discord] Unexpected error while sending %s.", kind)
+            # Timed flush for lines that were pushed but never flushed
+            if (
+                self._log_buffer
+                and time.monotonic() - self._last_flush_ts >= FLUSH_INTERVAL_SECONDS
+            ):
+                self.flush_log_buffer()
+
+    @staticmethod
+    def _split_message(message: str) -> list[str]:
+        """
+        Splits a message into chunks of at most MAX_MESSAGE_LENGTH characters,
+        breaking at newlines where possible.
+        """
+        chunks = []
+        while len(message) > MAX_MESSAGE_LENGTH:
+            cut = message.rfind("\n", 0, MAX_MESSAGE_LENGTH)
+            cut = cut + 1 if cut > 0 else MAX_MESSAGE_LENGTH
+            chunks.append(message[:cut])
+            message = message[cut:]
+        if message:
+            chunks.append(message)
+        return chunks
+
+    def _send_message(self, message: str):
+        for chunk in self._split_message(message):
+            try:
+                response = self._session.post(
+                    self.url,
+                    data=_json_dumps({"content": chunk}),
+                    headers=_JSON_HEADERS,
+                    timeout=self.timeout,
                 )
-        except Exception as e:
-            log.error(f"[Discord] An error occurred: {e}")
+                if response.status_code != 204:
+                    log.error(
+                        "[Discord] Failed to send notification. Status: %s",
+                        response.status_code,
+                    )
+            except requests.RequestException as e:
+                log.error("[Discord] An error occurred: %s", e)
 
     def push_log_buffer(self, message: str, log_level: str = "info"):
         """
         Buffers log messages to be sent later.
         """
-        if log_level.lower() == "info":
+        level = log_level.lower()
+        if level == "info":
             log.info(message)
-        elif log_level.lower() == "warning":
+        elif level == "warning":
             log.warning(message)
-        elif log_level.lower() == "error":
+        elif level == "error":
             log.error(message)
         else:
             log.debug(message)
-        now = datetime.now().strftime("%H:%M:%S")
-        self._log_buffer += f"{now} - {log_level.upper()} - {message}\n"
+        now = time.strftime("%H:%M:%S")
+        with self._log_buffer_lock:
+            line = f"{now} - {log_level.upper()} - {message}\n"
+            self._log_buffer.append(line)
+            self._log_buffer_length += len(line)
+            buffer_length = self._log_buffer_length
+        if buffer_length >= FLUSH_BUFFER_LENGTH:
+            self.flush_log_buffer()
 
     def flush_log_buffer(self):
         """
         Sends the buffered log messages as a single notification.
         """
-        if self._log_buffer:
-            self._send_message(self._log_buffer)
-            self._log_buffer = ""
+        with self._log_buffer_lock:
+            log_buffer = "".join(self._log_buffer)
+            self._log_buffer.clear()
+            self._log_buffer_length = 0
+            self._last_flush_ts = time.monotonic()
+        if log_buffer:
+            self._enqueue("message", log_buffer)
         else:
-            log.info("[Discord] No messages to send in the buffer.")
+            log.debug("[Discord] No messages to send in the buffer.")
 
-    def send_image(self, buffer):
-        files = {"file": ("image.jpg", buffer, "image/jpeg")}
+    def send_image(self, image: bytes):
+        """
+        Queues JPEG image bytes to be sent.
+        A BytesIO buffer is also accepted and read once.
+        """
+        if not isinstance(image, bytes):
+            image = image.getvalue()
+        self._enqueue("image", image)
+
+    def _send_image(self, image: bytes):
+        files = {"file": ("image.jpg", image, "image/jpeg")}
         try:
-            response = requests.post(self.url, files=files)
+            response = self._session.post(self.url, files=files, timeout=self.timeout)
             if response.status_code == 200:
                 return
             else:
                 log.error(
-                    f"[Discord] Failed to send image. Status: {response.status_code}"
+                    "[Discord] Failed to send image. Status: %s", response.status_code
                 )
-        except Exception as e:
-            log.error(f"[Discord] An error occurred while sending image: {e}")
+        except requests.RequestException as e:
+            log.error("[Discord] An error occurred while sending image: %s", e)
             return None
+
+    def close(self):
+        """
+        Sends whatever is still queued, stops the sender thread and releases
+        the pooled webhook connection.
+        """
+        if self._worker.is_alive():
+            if self._log_buffer:
+                self.flush_log_buffer()
+            try:
+                self._queue.put(None, timeout=self.timeout)
+            except queue.Full:
+                log.warning("[Discord] Send queue is full, closing without draining.")
+            else:
+                self._worker.join(timeout=self.timeout * 4)
+        self._session.close()
@@ -1,3 +1,6 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
 from gate_api import FuturesApi, FuturesOrder, UnifiedApi
 from gate_api.models.contract import Contract
 from gate_api.models.unified_account import UnifiedAccount
@@ -6,6 +9,15 @@ from gate_api.models.position import Position
 from config.logger_config import log
 from service.discord_client import DiscordClient
 
+# last_price is only used for order sizing, so a few seconds of staleness is fine
+CONTRACT_CACHE_TTL_SECONDS = 10.0
+# Calls within the same tick share one list_positions snapshot
+POSITIONS_SNAPSHOT_TTL_SECONDS = 1.0
+# Balance reads within this window reuse the last list_unified_accounts result
+BALANCE_CACHE_TTL_SECONDS = 2.0
+# create_batch_futures_order accepts at most 10 orders per request
+BATCH_ORDER_LIMIT = 10
+
 
 class OrderHandler:
     def __init__(
@@ -13,8 +25,9 @@ class OrderHandler:
         gate_futures_api: FuturesApi,
         gate_unified_api: UnifiedApi,
         discord_client: DiscordClient,
-        symbol_list: list[str],
+        symbol_list: tuple[str, ...],
         leverage: int,
+        max_concurrent_requests: int,
     ):
         self.gate_futures_api = gate_futures_api
         self.gate_unified_api = gate_unified_api
@@ -22,23 +35,40 @@ class OrderHandler:
         self.symbol_list = symbol_list
         self.leverage = leverage
         self.account_total_balance = 0.0
-        self.symbol_position_list = []
+        # Set after every order; the balance is re-fetched when stale or older
+        # than BALANCE_CACHE_TTL_SECONDS
+        self._balance_stale = True
+        self._balance_fetched_at = float("-inf")
+        self.symbol_position_map: dict[str, dict] = {}
+        # quanto_multiplier never changes for a contract, so it is kept forever;
+        # last_price is cached as (last_price, fetched_at) for a short TTL
+        self._quanto: dict[str, float] = {}
+        self._contract_cache: dict[str, tuple[float, float]] = {}
+        self._positions_snapshot: dict[str, Position] = {}
+        self._positions_fetched_at = float("-inf")
+        # Stale contracts are fetched in parallel, one request per symbol
+        self._contract_executor = ThreadPoolExecutor(
+            max_workers=min(max_concurrent_requests, len(symbol_list)),
+            thread_name_prefix="order-contract",
+        )
 
-        """Example of symbol_position_list:
-        [
-            {
+        """Example of symbol_position_map:
+        {
+            "BTC_USDT": {
                 "symbol": "BTC_USDT",
                 "last_price": 112233.44,
                 "minimum_position_size_in_quantity": 0.0001,
                 "minimum_position_size_in_usdt": 11.22,
                 "order_size_in_quantity": 100,
                 "order_size_in_usdt": 1122.33,
+                "signed_order_size_in_quantity": {"buy": 100, "sell": -100},
+                "signed_order_size_in_usdt": {"buy": 1122.33, "sell": -1122.33},
                 "current_position_size_in_quantity": -100,
                 "current_position_size_in_usdt": -1122.33
                 "current_position_side": "sell",
                 "unrealised_pnl": 1.23
             }
-        ]
+        }
         """
 
         self.set_account_total_balance()
@@ -51,78 +81,132 @@ class OrderHandler:
                 self.gate_unified_api.list_unified_accounts()
             )
             self.account_total_balance = float(unified_account.unified_account_total)
+            self._balance_stale = False
+            self._balance_fetched_at = time.monotonic()
+        except Exception as e:
+            log.error("[Order] Failed to get account balance: %s", e)
+            raise e
+
+    def _refresh_balance(self):
+        if (
+            self._balance_stale
+            or time.monotonic() - self._balance_fetched_at >= BALANCE_CACHE_TTL_SECONDS
+        ):
+            self.set_account_total_balance()
+
+    def _invalidate_balance(self):
+        self._balance_stale = True
+
+    def _fetch_contract(self, symbol: str) -> Contract:
+        return self.gate_futures_api.get_futures_contract(
+            settle="usdt", contract=symbol
+        )
+
+    def _refresh_contract_cache(self):
+        """
+        Refreshes last_price (and quanto_multiplier on first sight) of every
+        symbol whose cached entry is older than CONTRACT_CACHE_TTL_SECONDS,
+        with one get_futures_contract call per stale symbol, made concurrently.
+        """
+        now = time.monotonic()
+        contract_cache = self._contract_cache
+        stale_symbols = [
+            symbol
+            for symbol in self.symbol_list
+            if symbol not in contract_cache
+            or now - contract_cache[symbol][1] >= CONTRACT_CACHE_TTL_SECONDS
+        ]
+        if not stale_symbols:
+            return
+
+        try:
+            if len(stale_symbols) == 1:
+                contract_list = [self._fetch_contract(stale_symbols[0])]
+            else:
+                contract_list = list(
+                    self._contract_executor.map(self._fetch_contract, stale_symbols)
+                )
         except Exception as e:
-            log.error(f"[Order] Failed to get account balance: {e}")
+            log.error("[Order] Failed to get futures contracts: %s", e)
             raise e
 
+        for symbol, contract in zip(stale_symbols, contract_list):
+            if symbol not in self._quanto:
+                self._quanto[symbol] = float(contract.quanto_multiplier)
+            contract_cache[symbol] = (float(contract.last_price), now)
+
     def set_symbol_data_to_position_list(self):
+        self._refresh_contract_cache()
+
         for symbol in self.symbol_list:
             try:
-                contract_info: Contract = self.gate_futures_api.get_futures_contract(
-                    settle="usdt", contract=symbol
-                )
+                last_price = self._contract_cache[symbol][0]
+                quanto_multiplier = self._quanto[symbol]
 
-                # Find existing entry for the symbol
-                existing = next(
-                    (
-                        item
-                        for item in self.symbol_position_list
-                        if item["symbol"] == symbol
-                    ),
-                    None,
+                self.symbol_position_map.setdefault(symbol, {}).update(
+                    {
+                        "symbol": symbol,
+                        "last_price": last_price,
+                        "minimum_position_size_in_quantity": quanto_multiplier,
+                        "minimum_position_size_in_usdt": last_price * quanto_multiplier,
+                    }
                 )
-                symbol_data = {
-                    "symbol": symbol,
-                    "last_price": float(contract_info.last_price),
-                    "minimum_position_size_in_quantity": float(
-                        contract_info.quanto_multiplier
-                    ),
-                    "minimum_position_size_in_usdt": float(contract_info.last_price)
-                    * float(contract_info.quanto_multiplier),
-                }
-                if existing:
-                    existing.update(symbol_data)
-                else:
-                    self.symbol_position_list.append(symbol_data)
             except Exception as e:
-                log.error(f"[Order] Failed to get symbol data for {symbol}: {e}")
+                log.error("[Order] Failed to get symbol data for %s: %s", symbol, e)
                 raise e
 
-    def set_account_data_to_position_list(self):
+    def _refresh_positions(self):
+        """
+        Indexes open positions by contract with a single list_positions call.
+        The snapshot is reused for POSITIONS_SNAPSHOT_TTL_SECONDS unless it is
+        invalidated by an order.
+        """
+        now = time.monotonic()
+        if now - self._positions_fetched_at < POSITIONS_SNAPSHOT_TTL_SECONDS:
+            return
         current_position_list: list[Position] = self.gate_futures_api.list_positions(
             settle="usdt", holding=True
         )
-        for symbol_data in self.symbol_position_list:
-            symbol = symbol_data["symbol"]
+        self._positions_snapshot = {
+            getattr(p, "contract", None): p for p in current_position_list
+        }
+        self._positions_fetched_at = now
+
+    def _invalidate_positions(self):
+        self._positions_fetched_at = float("-inf")
+
+    def set_account_data_to_position_list(self):
+        self._refresh_positions()
+        positions_snapshot = self._positions_snapshot
+        # Balance is split evenly across symbols
+        order_size_in_usdt = (
+            self.account_total_balance * self.leverage / len(self.symbol_list)
+        )
+        for symbol, symbol_data in self.symbol_position_map.items():
             try:
-                current_position = next(
-                    (
-                        p
-                        for p in current_position_list
-                        if getattr(p, "contract", None) == symbol
-                    ),
-                    None,
-                )
+                current_position = positions_snapshot.get(symbol)
                 current_position_size = current_position.size if current_position else 0
                 unrealised_pnl = (
                     float(current_position.unrealised_pnl) if current_position else 0.0
                 )
 
+                order_size_in_quantity = int(
+                    order_size_in_usdt / symbol_data["minimum_position_size_in_usdt"]
+                )
+
                 symbol_data.update(
                     {
-                        "order_size_in_quantity": (
-                            int(
-                                self.account_total_balance
-                                * self.leverage
-                                / symbol_data["minimum_position_size_in_usdt"]
-                                / len(self.symbol_list)
-                            )
-                        ),
-                        "order_size_in_usdt": (
-                            self.account_total_balance
-                            * self.leverage
-                            / len(self.symbol_list)
-                        ),
+                        "order_size_in_quantity": order_size_in_quantity,
+                        "order_size_in_usdt": order_size_in_usdt,
+                        # Signed sizes per side, so placing an order is a lookup
+                        "signed_order_size_in_quantity": {
+                            "buy": abs(order_size_in_quantity),
+                            "sell": -abs(order_size_in_quantity),
+                        },
+                        "signed_order_size_in_usdt": {
+                            "buy": abs(order_size_in_usdt),
+                            "sell": -abs(order_size_in_usdt),
+                        },
                         "current_position_size_in_quantity": current_position_size,
                         "current_position_size_in_usdt": current_position_size
                         * symbol_data["minimum_position_size_in_usdt"],
@@ -135,34 +219,24 @@ class OrderHandler:
                     }
                 )
             except Exception as e:
-                log.error(f"[Order] Failed to get position for {symbol}: {e}")
+                log.error("[Order] Failed to get position for %s: %s", symbol, e)
                 raise e
 
     def place_market_open_order_after_close(self, symbol: str, side: str):
-        self.set_account_total_balance()
+        self._refresh_balance()
         self.set_symbol_data_to_position_list()
         self.set_account_data_to_position_list()
-        symbol_position = next(
-            (item for item in self.symbol_position_list if item["symbol"] == symbol),
-            None,
-        )
+        symbol_position = self.symbol_position_map.get(symbol)
         if symbol_position.get("current_position_side") == side:
             return
         if symbol_position.get("current_position_size_in_quantity", 0) != 0:
             self.place_market_close_order(symbol=symbol)
-        order_size_in_quantity = (
-            symbol_position.get("order_size_in_quantity", 0) if symbol_position else 0
-        )
-        order_size_in_usdt = (
-            symbol_position.get("order_size_in_usdt", 0) if symbol_position else 0
-        )
-        if side == "sell":
-            order_size_in_quantity = -abs(order_size_in_quantity)
-            order_size_in_usdt = -abs(order_size_in_usdt)
-        elif side == "buy":
-            order_size_in_quantity = abs(order_size_in_quantity)
-            order_size_in_usdt = abs(order_size_in_usdt)
-        else:
+        try:
+            order_size_in_quantity = symbol_position["signed_order_size_in_quantity"][
+                side
+            ]
+            order_size_in_usdt = symbol_position["signed_order_size_in_usdt"][side]
+        except KeyError:
             raise ValueError(f"Invalid side: {side}. Must be 'buy' or 'sell'.")
         futures_order = FuturesOrder(
             contract=symbol,
@@ -175,6 +249,8 @@ class OrderHandler:
                 settle="usdt",
                 futures_order=futures_order,
             )
+            self._invalidate_positions()
+            self._invalidate_balance()
             self.discord_client.push_log_buffer(
                 f"[Order] Open {side} {symbol}, price: {order_response.fill_price}, size: {order_size_in_usdt:.2f}, balance: {self.account_total_balance:.2f}",
                 "info",
@@ -182,8 +258,6 @@ class OrderHandler:
         except Exception as e:
             self.discord_client.push_log_buffer(e, "error")
             raise e
-        finally:
-            self.discord_client.flush_log_buffer()
 
     def place_market_close_order(self, symbol: str):
         futures_order = FuturesOrder(
@@ -198,15 +272,9 @@ class OrderHandler:
                 settle="usdt",
                 futures_order=futures_order,
             )
+            self._invalidate_positions()
             self.set_account_total_balance()
-            symbol_position = next(
-                (
-                    item
-                    for item in self.symbol_position_list
-                    if item["symbol"] == symbol
-                ),
-                None,
-            )
+            symbol_position = self.symbol_position_map.get(symbol)
             self.discord_client.push_log_buffer(
                 f"[Order] Closed {symbol_position.get('current_position_side')} {symbol}, price: {order_response.fill_price}, size: {symbol_position.get('current_position_size_in_usdt'):.2f}, balance: {self.account_total_balance:.2f}, PnL: {symbol_position.get('unrealised_pnl'):.2f}",
                 "info",
@@ -215,28 +283,152 @@ class OrderHandler:
         except Exception as e:
             self.discord_client.push_log_buffer(e)
             raise e
-        finally:
-            self.discord_client.flush_log_buffer()
+
+    def _create_futures_orders(self, futures_orders: list[FuturesOrder]) -> list:
+        """
+        Submits orders through create_batch_futures_order, BATCH_ORDER_LIMIT at a
+        time. Orders are never retried: a rejected order is reported and left
+        to the caller. Returns one response per order, in input order (None if
+        it failed).
+        """
+        order_responses = []
+        for start in range(0, len(futures_orders), BATCH_ORDER_LIMIT):
+            chunk = futures_orders[start : start + BATCH_ORDER_LIMIT]
+            batch_responses = self.gate_futures_api.create_batch_futures_order(
+                settle="usdt", futures_order=chunk
+            )
+            for futures_order, batch_response in zip(chunk, batch_responses):
+                if batch_response.succeeded:
+                    order_responses.append(batch_response)
+                    continue
+                self.discord_client.push_log_buffer(
+                    f"[Order] Batch order for {futures_order.contract} failed: {batch_response.label}: {batch_response.detail}",
+                    "error",
+                )
+                order_responses.append(None)
+        return order_responses
+
+    def place_market_open_orders_batch(self, orders: list[tuple[str, str]]):
+        """
+        Same as place_market_open_order_after_close for several (symbol, side)
+        signals at once: positions to flip are closed in one batch request,
+        then the new positions are opened in another.
+        """
+        # Last signal per symbol wins
+        orders = dict(orders)
+        if len(orders) == 1:
+            self.place_market_open_order_after_close(*next(iter(orders.items())))
+            return
+        for side in orders.values():
+            if side not in ("buy", "sell"):
+                raise ValueError(f"Invalid side: {side}. Must be 'buy' or 'sell'.")
+
+        self._refresh_balance()
+        self.set_symbol_data_to_position_list()
+        self.set_account_data_to_position_list()
+        orders = {
+            symbol: side
+            for symbol, side in orders.items()
+            if self.symbol_position_map[symbol].get("current_position_side") != side
+        }
+        if not orders:
+            return
+
+        failed_symbols = []
+        try:
+            close_symbols = [
+                symbol
+                for symbol in orders
+                if self.symbol_position_map[symbol].get(
+                    "current_position_size_in_quantity", 0
+                )
+                != 0
+            ]
+            if close_symbols:
+                close_responses = self._create_futures_orders(
+                    [
+                        FuturesOrder(
+                            contract=symbol, size=0, close=True, price="0", tif="ioc"
+                        )
+                        for symbol in close_symbols
+                    ]
+                )
+                self._invalidate_positions()
+                self.set_account_total_balance()
+                for symbol, order_response in zip(close_symbols, close_responses):
+                    if order_response is None:
+                        # Never open on top of a position that failed to close
+                        failed_symbols.append(symbol)
+                        del orders[symbol]
+                        continue
+                    symbol_position = self.symbol_position_map[symbol]
+                    self.discord_client.push_log_buffer(
+                        f"[Order] Closed {symbol_position.get('current_position_side')} {symbol}, price: {order_response.fill_price}, size: {symbol_position.get('current_position_size_in_usdt'):.2f}, balance: {self.account_total_balance:.2f}, PnL: {symbol_position.get('unrealised_pnl'):.2f}",
+                        "info",
+                    )
+                self.set_account_data_to_position_list()
+
+            open_orders = list(orders.items())
+            if open_orders:
+                open_responses = self._create_futures_orders(
+                    [
+                        FuturesOrder(
+                            contract=symbol,
+                            size=self.symbol_position_map[symbol][
+                                "signed_order_size_in_quantity"
+                            ][side],
+                            price="0",
+                            tif="ioc",
+                        )
+                        for symbol, side in open_orders
+                    ]
+                )
+                self._invalidate_positions()
+                self._invalidate_balance()
+                for (symbol, side), order_response in zip(open_orders, open_responses):
+                    if order_response is None:
+                        failed_symbols.append(symbol)
+                        continue
+                    order_size_in_usdt = self.symbol_position_map[symbol][
+                        "signed_order_size_in_usdt"
+                    ][side]
+                    self.discord_client.push_log_buffer(
+                        f"[Order] Open {side} {symbol}, price: {order_response.fill_price}, size: {order_size_in_usdt:.2f}, balance: {self.account_total_balance:.2f}",
+                        "info",
+                    )
+        except Exception as e:
+            self.discord_client.push_log_buffer(e, "error")
+            raise e
+        # Raised like the single-order path; each failure was already reported
+        if failed_symbols:
+            raise RuntimeError(f"Orders failed for: {', '.join(failed_symbols)}")
 
     def send_symbol_position_list_to_discord(self):
         self.set_symbol_data_to_position_list()
         self.set_account_data_to_position_list()
-        for symbol_data in self.symbol_position_list:
+        lines = []
+        total_unrealised_pnl = 0.0
+        for symbol_data in self.symbol_position_map.values():
+            total_unrealised_pnl += symbol_data["unrealised_pnl"]
             if symbol_data.get("current_position_size_in_quantity", 0) == 0:
                 continue
-            symbol = symbol_data["symbol"]
-            position_side = symbol_data.get("current_position_side", "none")
-            unrealised_pnl = symbol_data.get("unrealised_pnl", 0.0)
-            self.discord_client.push_log_buffer(
-                f"[Order] {symbol} - Side: {position_side}, "
+            lines.append(
+                f"[Order] {symbol_data['symbol']} - "
+                f"Side: {symbol_data.get('current_position_side', 'none')}, "
                 f"Last: {symbol_data['last_price']:.2f}, "
                 f"Size: {symbol_data['current_position_size_in_usdt']:.2f}, "
-                f"PnL: {unrealised_pnl:.2f}",
-                "info",
+                f"PnL: {symbol_data.get('unrealised_pnl', 0.0):.2f}"
             )
-        self.discord_client.push_log_buffer(
+        lines.append(
             f"[Order] Total - Balance: {self.account_total_balance:.2f}, "
-            f"PnL: {sum(item['unrealised_pnl'] for item in self.symbol_position_list):.2f}",
-            "info",
+            f"PnL: {total_unrealised_pnl:.2f}"
         )
+        # One entry for the whole report instead of one per symbol
+        self.discord_client.push_log_buffer("\n".join(lines), "info")
         self.discord_client.flush_log_buffer()
+
+    def close(self):
+        """
+        Stops the contract refresh threads.
+        """
+        self._contract_executor.shutdown(wait=True)
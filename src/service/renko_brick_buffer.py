@@ -0,0 +1,87 @@
+import numpy as np
+
+from service.renko_core import DIRECTION_NONE
+
+
+class RenkoBrickBuffer:
+    """
+    Keeps the most recent maxlen Renko bricks as three parallel arrays
+    (open, close, direction) instead of one dict per brick.
+    opens/closes/directions return contiguous views, oldest brick first.
+    """
+
+    __slots__ = ("maxlen", "_opens", "_closes", "_directions", "_start", "_end")
+
+    def __init__(self, maxlen: int):
+        self.maxlen = maxlen
+        # Twice the capacity so old bricks are compacted once every maxlen appends
+        capacity = 2 * maxlen
+        self._opens = np.empty(capacity, dtype=np.float64)
+        self._closes = np.empty(capacity, dtype=np.float64)
+        self._directions = np.empty(capacity, dtype=np.int8)
+        self._start = 0
+        self._end = 0
+
+    def __len__(self) -> int:
+        return self._end - self._start
+
+    def _compact(self, keep: int):
+        """
+        Moves the last keep bricks to the front of the arrays.
+        """
+        source = self._end - keep
+        self._opens[:keep] = self._opens[source : self._end]
+        self._closes[:keep] = self._closes[source : self._end]
+        self._directions[:keep] = self._directions[source : self._end]
+        self._start = 0
+        self._end = keep
+
+    def append(self, brick_open: float, brick_close: float, direction: int):
+        if self._end == self._opens.shape[0]:
+            self._compact(self.maxlen - 1)
+        end = self._end
+        self._opens[end] = brick_open
+        self._closes[end] = brick_close
+        self._directions[end] = direction
+        self._end = end + 1
+        if self._end - self._start > self.maxlen:
+            self._start += 1
+
+    def extend(self, opens: np.ndarray, closes: np.ndarray, directions: np.ndarray):
+        count = len(opens)
+        if count >= self.maxlen:
+            opens = opens[-self.maxlen :]
+            closes = closes[-self.maxlen :]
+            directions = directions[-self.maxlen :]
+            count = self.maxlen
+            self._start = self._end = 0
+        elif self._end + count > self._opens.shape[0]:
+            self._compact(min(len(self), self.maxlen - count))
+        end = self._end + count
+        self._opens[self._end : end] = opens
+        self._closes[self._end : end] = closes
+        self._directions[self._end : end] = directions
+        self._end = end
+        self._start = max(self._start, end - self.maxlen)
+
+    @property
+    def opens(self) -> np.ndarray:
+        return self._opens[self._start : self._end]
+
+    @property
+    def closes(self) -> np.ndarray:
+        return self._closes[self._start : self._end]
+
+    @property
+    def directions(self) -> np.ndarray:
+        return self._directions[self._start : self._end]
+
+    @property
+    def last_close(self) -> float:
+        return float(self._closes[self._end - 1])
+
+    @property
+    def last_direction(self) -> int:
+        if self._end == self._start:
+            return DIRECTION_NONE
+        return int(self._directions[self._end - 1])
@@ -1,15 +1,38 @@
 import io
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
-import matplotlib.pyplot as plt
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.collections import LineCollection
+from matplotlib.figure import Figure
 import numpy as np
 import talib
+from PIL import Image
 
 from gate_api.models.futures_candlestick import FuturesCandlestick
 from gate_api.models.futures_ticker import FuturesTicker
 from config.logger_config import log
 from service.discord_client import DiscordClient
 from service.order_handler import OrderHandler
+from service.renko_brick_buffer import RenkoBrickBuffer
+from service.renko_core import (
+    DIRECTION_DOWN,
+    DIRECTION_NONE,
+    DIRECTION_UP,
+    build_renko_bricks,
+    count_new_bricks,
+)
+
+# Only the most recent bricks are kept per symbol
+MAX_RENKO_BRICKS = 200
+# Plots are only viewed in Discord, a lower resolution and quality encode faster
+PLOT_DPI = 72
+PLOT_JPEG_QUALITY = 75
+# At most one signal plot per symbol in this window, orders are never throttled
+PLOT_MIN_INTERVAL_SECONDS = 30.0
+# Keeps borderline prices off the brick_band fast path, see _brick_band
+BRICK_BAND_SLACK = 1e-9
 
 
 class RenkoCalculator:
@@ -19,7 +42,7 @@ class RenkoCalculator:
 
     def __init__(
         self,
-        symbol_list: list[str],
+        symbol_list: tuple[str, ...],
         ohlcv_timeframe: str,
         atr_period: int,
         ohlcv_count: int,
@@ -27,72 +50,111 @@ class RenkoCalculator:
         order_handler: OrderHandler = None,
     ):
         self.symbol_data_list = []
+        # symbol -> its entry in symbol_data_list, for per-tick lookups
+        self.symbol_data_map = {}
         self.symbol_list = symbol_list
         self.ohlcv_timeframe = ohlcv_timeframe
         self.atr_period = atr_period
         self.ohlcv_count = ohlcv_count
         self.discord_client = discord_client
         self.order_handler = order_handler
+        # Plots are rendered off the ticker loop, one at a time
+        self._plot_executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="renko-plot"
+        )
+        # Only ever touched on the plot thread
+        self._plot_figure = None
+        self._plot_buffer = io.BytesIO()
 
     def set_ohlcv_list_into_symbol_data_list(
         self, symbol: str, candlestick_list: list[FuturesCandlestick]
     ):
         """
-        Adds new OHLCV bars (list of dicts) to the history and recalculates ATR.
-        Updates self.total_symbols_ohlcv_list to maintain per-symbol OHLCV data.
-        Each ohlcv_bar should be a dict with keys: 'o', 'h', 'l', 'c', 'v', 't', 'sum'.
+        Same as set_ohlcv_rows_into_symbol_data_list, but for FuturesCandlestick
+        models.
         """
-        # Parse bars from input
-        if not candlestick_list or len(candlestick_list) == 0:
+        if not candlestick_list:
             raise ValueError("[Renko] ohlcv_list must be a non-empty list.")
+        self.set_ohlcv_rows_into_symbol_data_list(
+            symbol=symbol,
+            candlestick_rows=[
+                {
+                    "o": candlestick_row.o,
+                    "h": candlestick_row.h,
+                    "l": candlestick_row.l,
+                    "c": candlestick_row.c,
+                    "v": candlestick_row.v,
+                    "t": candlestick_row.t,
+                }
+                for candlestick_row in candlestick_list
+            ],
+        )
 
-        parsed_ohlcv_list = []
-        for candlestick_row in candlestick_list:
-            parsed_ohlcv_row = [
-                float(candlestick_row.o),
-                float(candlestick_row.h),
-                float(candlestick_row.l),
-                float(candlestick_row.c),
-                float(candlestick_row.v),
-                int(candlestick_row.t),
-            ]
-            parsed_ohlcv_list.append(parsed_ohlcv_row)
-
-        self.symbol_data_list.append(
-            {
-                "symbol": symbol,
-                "ohlcv_list": parsed_ohlcv_list,
-            }
+    def set_ohlcv_rows_into_symbol_data_list(
+        self, symbol: str, candlestick_rows: list[dict]
+    ):
+        """
+        Converts the raw JSON rows returned by the candlesticks endpoint
+        (keys: 'o', 'h', 'l', 'c', 'v', 't') into a single OHLCV array and
+        stores it via set_ohlcv_array_into_symbol_data_list.
+        """
+        if not candlestick_rows:
+            raise ValueError("[Renko] candlestick_rows must be a non-empty list.")
+
+        # Built column-major in one allocation, so storing it below does not copy
+        ohlcv_array = np.array(
+            [
+                (row["o"], row["h"], row["l"], row["c"], row["v"], row["t"])
+                for row in candlestick_rows
+            ],
+            dtype=np.float64,
+            order="F",
+        )
+        self.set_ohlcv_array_into_symbol_data_list(
+            symbol=symbol, ohlcv_array=ohlcv_array
         )
 
+    def set_ohlcv_array_into_symbol_data_list(
+        self, symbol: str, ohlcv_array: np.ndarray
+    ):
+        """
+        Stores an (N, 6) float64 OHLCV array for the symbol.
+        Columns are ordered as: open, high, low, close, volume, timestamp.
+        The array is kept column-major so each column slice handed to
+        talib/build_renko_bricks is contiguous and is not copied.
+        """
+        if ohlcv_array is None or len(ohlcv_array) == 0:
+            raise ValueError("[Renko] ohlcv_array must be a non-empty array.")
+
+        symbol_data = {
+            "symbol": symbol,
+            "ohlcv_array": np.asfortranarray(ohlcv_array, dtype=np.float64),
+        }
+        previous_symbol_data = self.symbol_data_map.get(symbol)
+        if previous_symbol_data is None:
+            self.symbol_data_list.append(symbol_data)
+        else:
+            # Reloading a symbol (weekly re-init) replaces its entry in place
+            index = self.symbol_data_list.index(previous_symbol_data)
+            self.symbol_data_list[index] = symbol_data
+        self.symbol_data_map[symbol] = symbol_data
+
     def set_brick_size_into_symbol_data_list(self):
         """
         Iterates over each symbol in symbol_data_list and calculates renko_brick_size
-        using the symbol's ohlcv_list and ATR.
+        using the symbol's ohlcv_array and ATR.
         """
         for symbol_data in self.symbol_data_list:
-            ohlcv_list = symbol_data.get("ohlcv_list")
-            if not ohlcv_list or len(ohlcv_list) < self.atr_period + 1:
+            symbol_data.pop("brick_band", None)
+            ohlcv_array = symbol_data.get("ohlcv_array")
+            if ohlcv_array is None or len(ohlcv_array) < self.atr_period + 1:
                 symbol_data["renko_brick_size"] = None
                 continue
 
-            highs = [
-                bar[1] if isinstance(bar, list) else float(bar["h"])
-                for bar in ohlcv_list
-            ]
-            lows = [
-                bar[2] if isinstance(bar, list) else float(bar["l"])
-                for bar in ohlcv_list
-            ]
-            closes = [
-                bar[3] if isinstance(bar, list) else float(bar["c"])
-                for bar in ohlcv_list
-            ]
-
             atr_values = talib.ATR(
-                high=np.array(highs, dtype=np.float64),
-                low=np.array(lows, dtype=np.float64),
-                close=np.array(closes, dtype=np.float64),
+                high=ohlcv_array[:, 1],
+                low=ohlcv_array[:, 2],
+                close=ohlcv_array[:, 3],
                 timeperiod=self.atr_period,
             )
 
@@ -107,94 +169,41 @@ class RenkoCalculator:
 
     def set_renko_list_into_symbol_data_list(self):
         """
-        For each symbol in symbol_data_list, rebuilds the renko_list from ohlcv_list using the calculated renko_brick_size.
+        For each symbol in symbol_data_list, rebuilds the renko_list from ohlcv_array using the calculated renko_brick_size.
         """
+        signals = []
         for symbol_data in self.symbol_data_list:
-            ohlcv_list = symbol_data.get("ohlcv_list")
+            symbol_data.pop("brick_band", None)
+            ohlcv_array = symbol_data.get("ohlcv_array")
             renko_brick_size = symbol_data.get("renko_brick_size")
-            if not ohlcv_list or not renko_brick_size:
+            if ohlcv_array is None or len(ohlcv_array) == 0 or not renko_brick_size:
                 log.warning(
-                    f"[Renko] Cannot set historical bricks for {symbol_data.get('symbol')}: missing OHLCV or brick size."
+                    "[Renko] Cannot set historical bricks for %s: missing OHLCV or brick size.",
+                    symbol_data.get("symbol"),
                 )
-                symbol_data["renko_list"] = []
+                symbol_data["renko_list"] = RenkoBrickBuffer(MAX_RENKO_BRICKS)
                 continue
 
-            renko_bricks = []
-            last_renko_close = None
-
-            for ohlcv_row in ohlcv_list:
-                current_price = (
-                    ohlcv_row[3]
-                    if isinstance(ohlcv_row, list)
-                    else float(ohlcv_row["c"])
-                )
-                if last_renko_close is None:
-                    last_renko_close = (
-                        round(current_price / renko_brick_size) * renko_brick_size
-                    )
-                    continue
-
-                price_diff = current_price - last_renko_close
-                if price_diff == 0:
-                    continue
-
-                direction = "up" if price_diff > 0 else "down"
-                last_brick_direction = (
-                    renko_bricks[-1]["direction"] if renko_bricks else direction
-                )
-                threshold_brick_size = (
-                    renko_brick_size
-                    if last_brick_direction == direction
-                    else 2 * renko_brick_size
-                )
-
-                if (direction == "up" and price_diff >= threshold_brick_size) or (
-                    direction == "down" and price_diff <= -threshold_brick_size
-                ):
-                    total_diff = abs(price_diff)
-                    first_brick_size = threshold_brick_size
-                    remaining_diff = total_diff - first_brick_size
-                    count_additional_bricks = (
-                        1 + int(remaining_diff // renko_brick_size)
-                        if remaining_diff >= 0
-                        else 1
-                    )
-
-                    for i in range(count_additional_bricks):
-                        brick_open = last_renko_close
-                        if direction == "up":
-                            brick_close = brick_open + (
-                                first_brick_size if i == 0 else renko_brick_size
-                            )
-                        else:
-                            brick_close = brick_open - (
-                                first_brick_size if i == 0 else renko_brick_size
-                            )
-                        new_brick = {
-                            "open": brick_open,
-                            "close": brick_close,
-                            "direction": direction,
-                        }
-                        renko_bricks.append(new_brick)
-                        last_renko_close = brick_close
-                        first_brick_size = renko_brick_size
-            direction = renko_bricks[-1]["direction"]
-            side = "buy" if direction == "up" else "sell"
-            self.order_handler.place_market_open_order_after_close(
-                symbol_data.get("symbol"), side
+            closes = ohlcv_array[:, 3]
+            anchor_close = round(closes[0] / renko_brick_size) * renko_brick_size
+            brick_opens, brick_closes, brick_directions, _, _ = build_renko_bricks(
+                closes[1:], renko_brick_size, anchor_close, DIRECTION_NONE
             )
-            if len(renko_bricks) > 200:
-                renko_bricks = renko_bricks[-200:]
+            renko_bricks = RenkoBrickBuffer(MAX_RENKO_BRICKS)
+            renko_bricks.extend(brick_opens, brick_closes, brick_directions)
             symbol_data["renko_list"] = renko_bricks
+            if renko_bricks:
+                side = "buy" if renko_bricks.last_direction == DIRECTION_UP else "sell"
+                signals.append((symbol_data.get("symbol"), side))
+
+        # Align every symbol's position with its last brick in one batch
+        if signals:
+            self.order_handler.place_market_open_orders_batch(signals)
 
     def handle_new_ticker_data(self, ticker_data_list: list[FuturesTicker]):
         """
-        Processes new incoming ticker data, updates renko_list in self.symbol_data_list.
-        Only processes symbols present in self.symbol_data_list.
-        If a new brick is formed, appends it to renko_list.
-        If a buy/sell signal (brick direction changes), sends order via order_handler.
+        Same as handle_new_ticker_rows, but for FuturesTicker models.
         """
-        # 1. validate ticker_data
         if (
             not ticker_data_list
             or not isinstance(ticker_data_list, list)
@@ -203,159 +212,270 @@ class RenkoCalculator:
             # If ticker_data_list is empty or not a list
             log.warning("[Renko] Invalid ticker_data_list format.")
             return
+        self.handle_new_ticker_rows(
+            [
+                {"contract": ticker_data.contract, "last": ticker_data.last}
+                for ticker_data in ticker_data_list
+            ]
+        )
 
-        # 2. filter ticker_data to only include valid symbols
-        filtered_ticker_data_list = [
-            {
-                "contract": ticker_data.contract,
-                "last": ticker_data.last,
-            }
-            for ticker_data in ticker_data_list
-            if ticker_data.contract in self.symbol_list
-        ]
-
-        for filtered_ticker_data in filtered_ticker_data_list:
-            symbol = filtered_ticker_data.get("contract")
-            last_str = filtered_ticker_data.get("last")
-            try:
-                current_price = float(last_str)
-            except (ValueError, TypeError):
-                continue
+    def handle_new_ticker_rows(self, ticker_rows: list[dict]):
+        """
+        Processes the raw JSON rows returned by the tickers endpoint
+        (keys: 'contract', 'last', ...), updates renko_list in self.symbol_data_list.
+        Only processes symbols present in self.symbol_data_list.
+        If a new brick is formed, appends it to renko_list.
+        If a buy/sell signal (brick direction changes), sends order via order_handler.
+        """
+        if not ticker_rows or not isinstance(ticker_rows, list):
+            log.warning("[Renko] Invalid ticker_rows format.")
+            return
 
-            # Find symbol_data for this symbol
-            symbol_data = next(
-                (s for s in self.symbol_data_list if s.get("symbol") == symbol), None
-            )
-            if not symbol_data:
+        # One dict lookup both filters the symbol and finds its data
+        symbol_data_map = self.symbol_data_map
+        handle_price = self._handle_new_price_for_symbol_data
+        signals = []
+        for ticker_row in ticker_rows:
+            symbol_data = symbol_data_map.get(ticker_row.get("contract"))
+            if symbol_data is None:
                 continue
-
-            brick_size = symbol_data.get("renko_brick_size")
-            if brick_size is None:
+            try:
+                current_price = float(ticker_row.get("last"))
+            except (ValueError, TypeError):
                 continue
+            handle_price(symbol_data, current_price, signals)
+        if signals:
+            self.place_signal_orders(signals)
 
-            renko_bricks = symbol_data.setdefault("renko_list", [])
-            last_renko_close = (
-                renko_bricks[-1]["close"]
-                if renko_bricks
-                else symbol_data.get("last_renko_close")
-            )
-            last_brick_direction = (
-                renko_bricks[-1]["direction"] if renko_bricks else None
-            )
+    def place_signal_orders(self, signals: list[tuple[str, str]]):
+        """
+        Sends the (symbol, side) signals collected during one tick to
+        order_handler as a single batch.
+        """
+        try:
+            self.order_handler.place_market_open_orders_batch(signals)
+        except Exception as e:
+            symbols = ", ".join(symbol for symbol, _ in signals)
+            log.error("[Renko] Order error for %s: %s", symbols, e)
 
-            if last_renko_close is None:
-                last_renko_close = round(current_price / brick_size) * brick_size
-                symbol_data["last_renko_close"] = last_renko_close
-                continue
+    def _handle_new_price_for_symbol_data(
+        self,
+        symbol_data: dict,
+        current_price: float,
+        signals: list[tuple[str, str]] = None,
+    ):
+        """
+        Pushes a single price for the symbol through the Renko brick logic.
+        If a new brick is formed, appends it to renko_list.
+        If a buy/sell signal (brick direction changes), sends order via order_handler,
+        or appends (symbol, side) to signals when a list is given.
+        """
+        # Fast path for the common tick that cannot form a brick
+        brick_band = symbol_data.get("brick_band")
+        if brick_band is not None and brick_band[0] < current_price < brick_band[1]:
+            return
 
-            price_diff = current_price - last_renko_close
-            if price_diff == 0:
-                continue
+        brick_size = symbol_data.get("renko_brick_size")
+        if brick_size is None:
+            return
 
-            direction = "up" if price_diff > 0 else "down"
-            threshold_brick_size = (
-                brick_size
-                if last_brick_direction == direction or last_brick_direction is None
-                else 2 * brick_size
+        renko_bricks = symbol_data.get("renko_list")
+        if renko_bricks is None:
+            # Bounded: appending past MAX_RENKO_BRICKS drops the oldest brick
+            renko_bricks = symbol_data["renko_list"] = RenkoBrickBuffer(
+                MAX_RENKO_BRICKS
             )
+        if renko_bricks:
+            last_renko_close = renko_bricks.last_close
+            last_brick_direction = renko_bricks.last_direction
+        else:
+            last_renko_close = symbol_data.get("last_renko_close")
+            last_brick_direction = DIRECTION_NONE
+
+        if last_renko_close is None:
+            last_renko_close = round(current_price / brick_size) * brick_size
+            symbol_data["last_renko_close"] = last_renko_close
+            return
 
-            if (direction == "up" and price_diff >= threshold_brick_size) or (
-                direction == "down" and price_diff <= -threshold_brick_size
-            ):
-                total_diff = abs(price_diff)
-                first_brick_size = threshold_brick_size
-                remaining_diff = total_diff - first_brick_size
-                count_additional_bricks = (
-                    1 + int(remaining_diff // brick_size) if remaining_diff >= 0 else 1
-                )
+        direction, count, first_brick_size = count_new_bricks(
+            current_price - last_renko_close,
+            brick_size,
+            last_brick_direction,
+        )
+        if count == 0:
+            symbol_data["brick_band"] = _brick_band(
+                last_renko_close, brick_size, last_brick_direction
+            )
+            return
 
-                for i in range(count_additional_bricks):
-                    brick_open = last_renko_close
-                    if direction == "up":
-                        brick_close = brick_open + (
-                            first_brick_size if i == 0 else brick_size
-                        )
-                    else:
-                        brick_close = brick_open - (
-                            first_brick_size if i == 0 else brick_size
-                        )
-                    new_brick = {
-                        "open": brick_open,
-                        "close": brick_close,
-                        "direction": direction,
-                    }
-                    renko_bricks.append(new_brick)
-                    # Trade signal processing
-                    if (
-                        last_brick_direction
-                        and direction != last_brick_direction
-                        and self.order_handler
-                    ):
-                        side = "buy" if direction == "up" else "sell"
-                        try:
-                            self.send_renko_plot_to_discord(symbol)
-                            self.order_handler.place_market_open_order_after_close(
-                                symbol, side
-                            )
-                        except Exception as e:
-                            log.error(f"[Renko] Order error for {symbol}: {e}")
-                    last_brick_direction = direction
-                    last_renko_close = brick_close
-                    first_brick_size = brick_size
-                symbol_data["last_renko_close"] = last_renko_close
-
-            # Keep only last 200 bricks
-            if len(renko_bricks) > 200:
-                symbol_data["renko_list"] = renko_bricks[-200:]
+        append_brick = renko_bricks.append
+        for _ in range(count):
+            brick_open = last_renko_close
+            if direction == DIRECTION_UP:
+                last_renko_close = brick_open + first_brick_size
+            else:
+                last_renko_close = brick_open - first_brick_size
+            append_brick(brick_open, last_renko_close, direction)
+            first_brick_size = brick_size
+        symbol_data["last_renko_close"] = last_renko_close
+        symbol_data["brick_band"] = _brick_band(last_renko_close, brick_size, direction)
+
+        # Trade signal processing, once per tick: every brick of a tick shares
+        # one direction, so only the first one can be a reversal
+        if not (
+            last_brick_direction
+            and direction != last_brick_direction
+            and self.order_handler
+        ):
+            return
+        symbol = symbol_data["symbol"]
+        side = "buy" if direction == DIRECTION_UP else "sell"
+        now = time.monotonic()
+        last_plot_ts = symbol_data.get("last_plot_ts")
+        if last_plot_ts is None or now - last_plot_ts >= PLOT_MIN_INTERVAL_SECONDS:
+            symbol_data["last_plot_ts"] = now
+            try:
+                self.send_renko_plot_to_discord(symbol)
+            except Exception as e:
+                log.error("[Renko] Plot error for %s: %s", symbol, e)
+        if signals is None:
+            self.place_signal_orders([(symbol, side)])
+        else:
+            signals.append((symbol, side))
 
     def send_renko_plot_to_discord(self, symbol: str):
-        if not self.discord_client:
-            return
         """
-        Plots the historical Renko bricks for the given symbol and sends the image to Discord.
+        Queues a plot of the current Renko bricks for the given symbol.
+        The bricks are copied here, rendering and sending happen on the plot thread.
         """
+        if not self.discord_client:
+            return
         # Find symbol_data for the given symbol
-        symbol_data = next(
-            (s for s in self.symbol_data_list if s.get("symbol") == symbol), None
-        )
+        symbol_data = self.symbol_data_map.get(symbol)
         if not symbol_data or not symbol_data.get("renko_list"):
-            log.warning(f"[Renko] No Renko bricks to plot for symbol: {symbol}")
+            log.warning("[Renko] No Renko bricks to plot for symbol: %s", symbol)
             return None
 
         renko_bricks = symbol_data["renko_list"]
-        opens = [brick["open"] for brick in renko_bricks]
-        closes = [brick["close"] for brick in renko_bricks]
-        directions = [brick["direction"] for brick in renko_bricks]
-
-        fig, ax = plt.subplots(figsize=(12, 6))
-        fig.patch.set_facecolor("black")
-        ax.set_facecolor("black")
-        for i, (open_price, close_price, direction) in enumerate(
-            zip(opens, closes, directions)
-        ):
-            color = "green" if direction == "up" else "red"
-            ax.plot([i, i], [open_price, close_price], color=color, linewidth=2)
-
         current_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        ax.set_title(
+        self._plot_executor.submit(
+            self._send_renko_plot,
+            symbol,
             f"{symbol}, {self.ohlcv_timeframe} Renko ({self.atr_period}), {current_time}",
-            color="white",
-            loc="center",
-            fontsize=14,
+            renko_bricks.opens.copy(),
+            renko_bricks.closes.copy(),
+            renko_bricks.directions.copy(),
         )
-        ax.set_xlabel("Brick Index", color="white")
-        ax.set_ylabel("Price", color="white")
-        ax.tick_params(axis="x", colors="white")
-        ax.tick_params(axis="y", colors="white")
-        ax.spines["bottom"].set_color("white")
-        ax.spines["top"].set_color("white")
-        ax.spines["left"].set_color("white")
-        ax.spines["right"].set_color("white")
-
-        buffer = io.BytesIO()
-        plt.savefig(buffer, format="jpg", facecolor=fig.get_facecolor())
-        plt.close(fig)
-        buffer.seek(0)
-
-        self.discord_client.send_image(buffer)
-        buffer.close()
+
+    def _send_renko_plot(
+        self,
+        symbol: str,
+        title: str,
+        opens: np.ndarray,
+        closes: np.ndarray,
+        directions: np.ndarray,
+    ):
+        try:
+            if self._plot_figure is None:
+                self._plot_figure = new_renko_figure()
+            image = render_renko_plot(
+                self._plot_figure,
+                self._plot_buffer,
+                title,
+                opens,
+                closes,
+                directions,
+            )
+            self.discord_client.send_image(image)
+        except Exception as e:
+            log.error("[Renko] Plot error for %s: %s", symbol, e)
+
+    def close(self):
+        """
+        Waits for queued plots to be rendered and handed to discord_client.
+        """
+        self._plot_executor.shutdown(wait=True)
+
+
+def _brick_band(
+    last_close: float, brick_size: float, last_direction: int
+) -> tuple[float, float]:
+    """
+    Returns the open (low, high) price band in which count_new_bricks forms no
+    brick: one brick_size to continue, two to reverse.
+    The band is narrowed by BRICK_BAND_SLACK so prices within rounding error of
+    a threshold still go through count_new_bricks.
+    """
+    up_step = 2 * brick_size if last_direction == DIRECTION_DOWN else brick_size
+    down_step = 2 * brick_size if last_direction == DIRECTION_UP else brick_size
+    slack = brick_size * BRICK_BAND_SLACK
+    return last_close - down_step + slack, last_close + up_step - slack
+
+
+def new_renko_figure() -> Figure:
+    """
+    Creates and styles the Figure render_renko_plot draws into.
+    A standalone Figure (no pyplot state) is safe to use off the main thread.
+    """
+    fig = Figure(figsize=(12, 6), dpi=PLOT_DPI)
+    # Attach an Agg canvas so rendering never depends on the configured backend
+    FigureCanvasAgg(fig)
+    fig.patch.set_facecolor("black")
+    ax = fig.subplots()
+    # Styling is applied once here, render_renko_plot only swaps the data
+    ax.set_facecolor("black")
+    ax.set_title("", color="white", loc="center", fontsize=14)
+    ax.set_xlabel("Brick Index", color="white")
+    ax.set_ylabel("Price", color="white")
+    ax.tick_params(axis="x", colors="white")
+    ax.tick_params(axis="y", colors="white")
+    ax.spines["bottom"].set_color("white")
+    ax.spines["top"].set_color("white")
+    ax.spines["left"].set_color("white")
+    ax.spines["right"].set_color("white")
+    # A single collection is drawn in one pass instead of one Line2D per brick
+    ax.add_collection(LineCollection([], linewidths=2))
+    return fig
+
+
+def render_renko_plot(
+    fig: Figure,
+    buffer: io.BytesIO,
+    title: str,
+    opens: np.ndarray,
+    closes: np.ndarray,
+    directions: np.ndarray,
+) -> bytes:
+    """
+    Renders Renko bricks as a JPEG image into a fig from new_renko_figure,
+    and encodes it through buffer, which is rewound and reused.
+    The same fig and buffer must not be used from two threads at once.
+    """
+    # One vertical segment per brick: (index, open) -> (index, close)
+    segments = np.empty((len(opens), 2, 2), dtype=np.float64)
+    segments[:, :, 0] = np.arange(len(opens))[:, None]
+    segments[:, 0, 1] = opens
+    segments[:, 1, 1] = closes
+
+    ax = fig.axes[0]
+    collection = ax.collections[0]
+    collection.set_segments(segments)
+    collection.set_color(np.where(directions == DIRECTION_UP, "green", "red"))
+    ax.title.set_text(title)
+    # Fit the view to this plot's bricks only
+    ax.ignore_existing_data_limits = True
+    ax.update_datalim(segments.reshape(-1, 2))
+    ax.autoscale_view()
+
+    # Encode the Agg canvas with Pillow directly, skipping savefig's
+    # per-call dpi/facecolor swap and print_figure bookkeeping
+    canvas = fig.canvas
+    canvas.draw()
+    image = Image.frombuffer(
+        "RGBA", canvas.get_width_height(), canvas.buffer_rgba(), "raw", "RGBA", 0, 1
+    ).convert("RGB")
+    buffer.seek(0)
+    buffer.truncate()
+    image.save(buffer, format="JPEG", quality=PLOT_JPEG_QUALITY, optimize=False)
+    # The bytes are queued for the Discord sender, so hand out a copy
+    return buffer.getvalue()
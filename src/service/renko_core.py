@@ -0,0 +1,92 @@
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:
+    # numba is optional; without it the kernels run as plain Python.
+    def njit(*args, **kwargs):
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return lambda func: func
+
+
+DIRECTION_UP = 1
+DIRECTION_DOWN = -1
+DIRECTION_NONE = 0
+
+
+@njit(cache=True)
+def count_new_bricks(price_diff, brick_size, last_direction):
+    """
+    Applies the Renko rules to a move of price_diff away from the last brick close.
+    A continuation needs one brick_size, a reversal needs two.
+    Returns (direction, brick_count, first_brick_size).
+    """
+    if price_diff == 0:
+        return DIRECTION_NONE, 0, brick_size
+
+    direction = DIRECTION_UP if price_diff > 0 else DIRECTION_DOWN
+    # last_direction * direction is negative only for a reversal, so the
+    # threshold is one brick_size or two without a branch
+    threshold_brick_size = brick_size * (1 + (last_direction * direction < 0))
+
+    total_diff = abs(price_diff)
+    if total_diff < threshold_brick_size:
+        return direction, 0, threshold_brick_size
+    count = 1 + int((total_diff - threshold_brick_size) // brick_size)
+    return direction, count, threshold_brick_size
+
+
+@njit(cache=True)
+def build_renko_bricks(prices, brick_size, last_close, last_direction):
+    """
+    Replays a float64 price array through the Renko rules, starting from
+    last_close and last_direction (DIRECTION_NONE if there is no brick yet).
+    Returns (opens, closes, directions, last_close, last_direction).
+    """
+    capacity = 64
+    opens = np.empty(capacity, dtype=np.float64)
+    closes = np.empty(capacity, dtype=np.float64)
+    directions = np.empty(capacity, dtype=np.int8)
+    n = 0
+
+    for i in range(prices.shape[0]):
+        direction, count, step = count_new_bricks(
+            prices[i] - last_close, brick_size, last_direction
+        )
+        if count == 0:
+            continue
+
+        if n + count > capacity:
+            while n + count > capacity:
+                capacity *= 2
+            grown_opens = np.empty(capacity, dtype=np.float64)
+            grown_closes = np.empty(capacity, dtype=np.float64)
+            grown_directions = np.empty(capacity, dtype=np.int8)
+            grown_opens[:n] = opens[:n]
+            grown_closes[:n] = closes[:n]
+            grown_directions[:n] = directions[:n]
+            opens, closes, directions = grown_opens, grown_closes, grown_directions
+
+        for _ in range(count):
+            opens[n] = last_close
+            if direction == DIRECTION_UP:
+                last_close = last_close + step
+            else:
+                last_close = last_close - step
+            closes[n] = last_close
+            directions[n] = direction
+            n += 1
+            step = brick_size
+        last_direction = direction
+
+    return opens[:n], closes[:n], directions[:n], last_close, last_direction
+
+
+def warm_up():
+    """
+    Runs both kernels once on dummy data so a Numba build compiles (or loads
+    its cache) at startup instead of on the first live tick.
+    """
+    count_new_bricks(1.0, 1.0, DIRECTION_NONE)
+    build_renko_bricks(np.linspace(100.0, 110.0, 10), 1.0, 100.0, DIRECTION_NONE)